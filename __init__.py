@@ -3,46 +3,56 @@
 Simple SDK to easily add rate limits per second and tokens per minute.
 """
 
-from mistral_ratelimit.client import MistralRatelimitClient
-from mistral_ratelimit.config import RatelimitConfig
-from mistral_ratelimit.exceptions import (
-    ConfigurationError,
-    MistralRatelimitError,
-    RateLimitExceeded,
-    TokenCountingError,
-)
+import importlib
+from importlib.metadata import PackageNotFoundError
+from importlib.metadata import version as _version
+from typing import TYPE_CHECKING, Any
 
-# For local development
-try:
+if TYPE_CHECKING:
     from mistral_ratelimit.client import MistralRatelimitClient
-except ImportError:
-    from client import MistralRatelimitClient
-try:
     from mistral_ratelimit.config import RatelimitConfig
-except ImportError:
-    from config import RatelimitConfig
-try:
     from mistral_ratelimit.exceptions import (
         ConfigurationError,
         MistralRatelimitError,
         RateLimitExceeded,
         TokenCountingError,
     )
-except ImportError:
-    from exceptions import (
-        ConfigurationError,
-        MistralRatelimitError,
-        RateLimitExceeded,
-        TokenCountingError,
-    )
 
-__version__ = "0.1.0"
+try:
+    __version__ = _version("mistral-ratelimit")
+except PackageNotFoundError:  # Running from a source checkout without an install
+    __version__ = "0.0.0+local"
 
-__all__ = [
+__all__ = (
     "MistralRatelimitClient",
     "RatelimitConfig",
     "MistralRatelimitError",
     "RateLimitExceeded",
     "TokenCountingError",
     "ConfigurationError",
-]
+)
+
+# Public names resolved on first access (PEP 562), so importing the package
+# does not pull in the Mistral SDK or tiktoken until they are actually needed.
+_LAZY = {
+    "MistralRatelimitClient": "mistral_ratelimit.client",
+    "RatelimitConfig": "mistral_ratelimit.config",
+    "MistralRatelimitError": "mistral_ratelimit.exceptions",
+    "RateLimitExceeded": "mistral_ratelimit.exceptions",
+    "TokenCountingError": "mistral_ratelimit.exceptions",
+    "ConfigurationError": "mistral_ratelimit.exceptions",
+}
+
+
+def __getattr__(name: str) -> Any:
+    try:
+        module_name = _LAZY[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_LAZY))
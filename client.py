@@ -3,7 +3,8 @@
 from __future__ import annotations
 
 import asyncio
-from collections.abc import AsyncIterator, Iterator
+import sys
+from collections.abc import AsyncIterator, Callable, Iterator
 from typing import Any, Mapping
 
 from mistralai import Mistral
@@ -21,9 +22,93 @@ except ImportError:
 
 from config import RatelimitConfig
 from exceptions import MistralRatelimitError, RateLimitExceeded
-from rate_limiter import AsyncRateLimiter, RateLimiter
+from rate_limiter import AsyncRateLimiter, RateLimitBuckets, RateLimiter
 from token_counter import TokenCounter
 
+# Tokens reserved on top of the input estimate to cover the response
+_ESTIMATE_MARGIN = 100
+
+# Stream event type carrying final usage. Interned so the equality check on each
+# event can short-circuit on identity when the SDK hands back the same object.
+_DONE_EVENT_TYPE = sys.intern("conversation.response.done")
+
+# SDK parameter names for each conversation operation, in signature order.
+# Passed to _filter_none alongside the matching argument values.
+_START_PARAMS = (
+    "model",
+    "agent_id",
+    "instructions",
+    "tools",
+    "completion_args",
+    "store",
+    "handoff_execution",
+    "metadata",
+    "name",
+    "description",
+    "agent_version",
+    "retries",
+    "server_url",
+    "timeout_ms",
+    "http_headers",
+)
+
+_APPEND_PARAMS = (
+    "completion_args",
+    "store",
+    "handoff_execution",
+    "retries",
+    "server_url",
+    "timeout_ms",
+    "http_headers",
+)
+
+_RESTART_PARAMS = (
+    "completion_args",
+    "store",
+    "handoff_execution",
+    "metadata",
+    "agent_version",
+    "retries",
+    "server_url",
+    "timeout_ms",
+    "http_headers",
+)
+
+
+def _filter_none(names: tuple[str, ...], values: tuple[Any, ...]) -> dict[str, Any]:
+    """Build SDK kwargs from parameter names and values, skipping None values.
+
+    The Mistral API rejects certain None values (e.g., handoff_execution with model).
+    This ensures we only send parameters that are explicitly set, without first
+    materializing a dict of every optional parameter.
+
+    A fresh dict is returned on every call on purpose: calling ``op(**kwargs)``
+    copies it into the callee's own keyword dict anyway, so reusing pooled dicts
+    would not save an allocation, and a recycled dict could be mutated while a
+    streaming request that still references its values is in flight.
+    """
+    return {k: v for k, v in zip(names, values, strict=True) if v is not None}
+
+
+def _retry_after(error: Exception) -> float | None:
+    """Read the Retry-After header from an SDK error, if it has one.
+
+    Args:
+        error: Exception raised by the Mistral SDK
+
+    Returns:
+        Seconds to wait before retrying, or None if absent or not a number
+    """
+    headers = getattr(error, "headers", None)
+    if headers is None:
+        headers = getattr(getattr(error, "raw_response", None), "headers", None)
+    if headers is None:
+        return None
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
 
 class RateLimitedConversations:
     """Rate-limited wrapper for Mistral beta.conversations API.
@@ -32,6 +117,42 @@ class RateLimitedConversations:
     Supports sync, async, and streaming variants with full parameter support.
     """
 
+    __slots__ = (
+        "_client",
+        "_rate_limiter",
+        "_async_rate_limiter",
+        "_token_counter",
+        "_config",
+        "_acquire",
+        "_acquire_async",
+        "_count_text",
+        "_count_texts",
+        "_count_messages",
+        "_estimators",
+        "_sdk_start",
+        "_sdk_start_async",
+        "_sdk_start_stream",
+        "_sdk_start_stream_async",
+        "_sdk_append",
+        "_sdk_append_async",
+        "_sdk_append_stream",
+        "_sdk_append_stream_async",
+        "_sdk_restart",
+        "_sdk_restart_async",
+        "_sdk_restart_stream",
+        "_sdk_restart_stream_async",
+        "_sdk_get",
+        "_sdk_get_async",
+        "_sdk_get_history",
+        "_sdk_get_history_async",
+        "_sdk_get_messages",
+        "_sdk_get_messages_async",
+        "_sdk_list",
+        "_sdk_list_async",
+        "_sdk_delete",
+        "_sdk_delete_async",
+    )
+
     def __init__(
         self,
         client: Mistral,
@@ -47,43 +168,99 @@ class RateLimitedConversations:
         self._token_counter = token_counter
         self._config = config
 
+        # Bound once; acquire runs before every request
+        self._acquire = rate_limiter.acquire
+        self._acquire_async = async_rate_limiter.acquire
+
+        # Exact tokenizer counts only when requested; by default a cheap byte-length
+        # estimate is reserved and the bucket is reconciled against actual usage.
+        self._count_text: Callable[[str], int]
+        self._count_texts: Callable[[list[str]], list[int]]
+        self._count_messages: Callable[[list[dict[str, Any]]], int]
+        if config.accurate_estimation:
+            self._count_text = token_counter.count_text
+            self._count_texts = token_counter.count_texts_batch
+            self._count_messages = token_counter.count_messages
+        else:
+            self._count_text = token_counter.estimate_text_fast
+            self._count_texts = token_counter.estimate_texts_fast
+            self._count_messages = token_counter.estimate_messages_fast
+
+        # Token estimators keyed by input type, so the common cases are one dict lookup
+        self._estimators: dict[type, Callable[[Any], int]] = {
+            str: self._count_text,
+            list: self._estimate_list,
+            dict: self._estimate_dict,
+        }
+
+        # Resolve SDK operations once rather than walking client.beta.conversations per call
+        conversations = client.beta.conversations
+        self._sdk_start = conversations.start
+        self._sdk_start_async = conversations.start_async
+        self._sdk_start_stream = conversations.start_stream
+        self._sdk_start_stream_async = conversations.start_stream_async
+        self._sdk_append = conversations.append
+        self._sdk_append_async = conversations.append_async
+        self._sdk_append_stream = conversations.append_stream
+        self._sdk_append_stream_async = conversations.append_stream_async
+        self._sdk_restart = conversations.restart
+        self._sdk_restart_async = conversations.restart_async
+        self._sdk_restart_stream = conversations.restart_stream
+        self._sdk_restart_stream_async = conversations.restart_stream_async
+        self._sdk_get = conversations.get
+        self._sdk_get_async = conversations.get_async
+        self._sdk_get_history = conversations.get_history
+        self._sdk_get_history_async = conversations.get_history_async
+        self._sdk_get_messages = conversations.get_messages
+        self._sdk_get_messages_async = conversations.get_messages_async
+        self._sdk_list = conversations.list
+        self._sdk_list_async = conversations.list_async
+        self._sdk_delete = conversations.delete
+        self._sdk_delete_async = conversations.delete_async
+
     def _estimate_tokens(self, inputs: Any) -> int:
         """Estimate tokens from conversation inputs."""
-        if isinstance(inputs, str):
-            return self._token_counter.count_text(inputs)
-        elif isinstance(inputs, list):
-            # List of messages or entries
-            if inputs and isinstance(inputs[0], dict):
-                # Check if it's a message dict or entry dict
-                if "content" in inputs[0]:
-                    return self._token_counter.count_messages(inputs)
-            # List of strings or mixed
-            tokens = 0
-            for item in inputs:
-                if isinstance(item, str):
-                    tokens += self._token_counter.count_text(item)
-                elif isinstance(item, dict):
-                    content = item.get("content", "")
-                    if isinstance(content, str):
-                        tokens += self._token_counter.count_text(content)
-            return tokens
-        elif isinstance(inputs, dict):
-            content = inputs.get("content", "")
-            if isinstance(content, str):
-                return self._token_counter.count_text(content)
+        estimate = self._estimators.get(type(inputs))
+        if estimate is None:
+            # Subclasses of the supported input types fall back to their base estimator
+            estimate = next(
+                (self._estimators[t] for t in type(inputs).__mro__ if t in self._estimators),
+                None,
+            )
+            if estimate is None:
+                return 100  # Conservative default
+        return estimate(inputs)
+
+    def _estimate_list(self, inputs: list[Any]) -> int:
+        """Estimate tokens from a list of messages or entries."""
+        # Check if it's a message dict or entry dict
+        if inputs and isinstance(inputs[0], dict) and "content" in inputs[0]:
+            return self._count_messages(inputs)
+        # List of strings or mixed: gather the text parts and count them in one batch
+        contents = [item.get("content") if isinstance(item, dict) else item for item in inputs]
+        texts = [content for content in contents if isinstance(content, str)]
+        return sum(self._count_texts(texts))
+
+    def _estimate_dict(self, inputs: dict[str, Any]) -> int:
+        """Estimate tokens from a single message or entry dict."""
+        content = inputs.get("content", "")
+        if isinstance(content, str):
+            return self._count_text(content)
         return 100  # Conservative default
 
     def _refund_tokens(self, estimated: int, actual_tokens: int) -> None:
-        """Refund unused tokens to the sync rate limiter bucket."""
-        if actual_tokens < estimated:
-            # Direct access to bucket is necessary here as RateLimiter doesn't expose refund
-            self._rate_limiter._token_bucket.available += estimated - actual_tokens
+        """Reconcile the sync rate limiter bucket with actual usage.
+
+        Unused tokens are refunded; usage above the estimate is charged, so
+        cheap estimates cannot let the bucket drift above the real rate.
+        """
+        if actual_tokens != estimated:
+            self._rate_limiter.refund(estimated - actual_tokens)
 
-    async def _refund_tokens_async(self, estimated: int, actual_tokens: int) -> None:
-        """Refund unused tokens to the async rate limiter bucket."""
-        if actual_tokens < estimated:
-            async with self._async_rate_limiter._lock:
-                self._async_rate_limiter._token_bucket.available += estimated - actual_tokens
+    def _refund_tokens_async(self, estimated: int, actual_tokens: int) -> None:
+        """Reconcile the async rate limiter bucket with actual usage."""
+        if actual_tokens != estimated:
+            self._async_rate_limiter.refund(estimated - actual_tokens)
 
     def _extract_usage(self, response: Any) -> int:
         """Extract total tokens used from a response object."""
@@ -98,39 +275,82 @@ class RateLimitedConversations:
             pass
         return 0
 
-    def _filter_none(self, kwargs: dict[str, Any]) -> dict[str, Any]:
-        """Filter out None values from kwargs to avoid sending nulls to API.
+    # ==================== DISPATCH ====================
+    #
+    # Every start/append/restart variant follows the same steps: estimate tokens,
+    # acquire from the rate limiter, call the SDK, then refund unused tokens.
+    # The public methods only build their kwargs and hand off to one of these
+    # along with the cached SDK operation.
 
-        The Mistral API rejects certain None values (e.g., handoff_execution with model).
-        This ensures we only send parameters that are explicitly set.
-        """
-        return {k: v for k, v in kwargs.items() if v is not None}
-
-    def _process_stream_response(self, stream: Iterator[Any], estimated: int) -> Iterator[Any]:
-        """Intercept stream events to track usage and refund tokens."""
-        for event in stream:
-            # Check for usage in 'conversation.response.done' event
-            # event.data might be an object or dict depending on SDK version
-            if hasattr(event, "data"):
-                data = event.data
-                event_type = getattr(data, "type", "")
-                if event_type == "conversation.response.done":
-                    actual = self._extract_usage(data)
+    def _call(self, op: Callable[..., Any], kwargs: dict[str, Any]) -> Any:
+        """Run a non-streaming conversation operation under the sync rate limiter."""
+        estimated = self._estimate_tokens(kwargs["inputs"]) + _ESTIMATE_MARGIN
+        self._acquire(request_tokens=1, token_count=estimated)
+
+        try:
+            kwargs["stream"] = False
+            response = op(**kwargs)
+            actual = self._extract_usage(response)
+            self._refund_tokens(estimated, actual)
+            return response
+        except Exception as e:
+            raise self._handle_error(e) from e
+
+    async def _call_async(self, op: Callable[..., Any], kwargs: dict[str, Any]) -> Any:
+        """Run a non-streaming conversation operation under the async rate limiter."""
+        estimated = self._estimate_tokens(kwargs["inputs"]) + _ESTIMATE_MARGIN
+        await self._acquire_async(request_tokens=1, token_count=estimated)
+
+        try:
+            kwargs["stream"] = False
+            response = await op(**kwargs)
+            actual = self._extract_usage(response)
+            self._refund_tokens_async(estimated, actual)
+            return response
+        except Exception as e:
+            raise self._handle_error(e) from e
+
+    def _stream(self, op: Callable[..., Any], kwargs: dict[str, Any]) -> Iterator[Any]:
+        """Run a streaming conversation operation under the sync rate limiter."""
+        estimated = self._estimate_tokens(kwargs["inputs"]) + _ESTIMATE_MARGIN
+        self._acquire(request_tokens=1, token_count=estimated)
+
+        try:
+            kwargs["stream"] = True
+            for event in op(**kwargs):
+                # Check for usage in 'conversation.response.done' event. A single
+                # attribute chain replaces hasattr/getattr probes on every event.
+                try:
+                    done = event.data.type == _DONE_EVENT_TYPE
+                except AttributeError:
+                    done = False
+                if done:
+                    actual = self._extract_usage(event.data)
                     self._refund_tokens(estimated, actual)
-            yield event
+                yield event
+        except Exception as e:
+            raise self._handle_error(e) from e
 
-    async def _process_stream_response_async(
-        self, stream: AsyncIterator[Any], estimated: int
+    async def _stream_async(
+        self, op: Callable[..., Any], kwargs: dict[str, Any]
     ) -> AsyncIterator[Any]:
-        """Intercept async stream events to track usage and refund tokens."""
-        async for event in stream:
-            if hasattr(event, "data"):
-                data = event.data
-                event_type = getattr(data, "type", "")
-                if event_type == "conversation.response.done":
-                    actual = self._extract_usage(data)
-                    await self._refund_tokens_async(estimated, actual)
-            yield event
+        """Run a streaming conversation operation under the async rate limiter."""
+        estimated = self._estimate_tokens(kwargs["inputs"]) + _ESTIMATE_MARGIN
+        await self._acquire_async(request_tokens=1, token_count=estimated)
+
+        try:
+            kwargs["stream"] = True
+            async for event in await op(**kwargs):
+                try:
+                    done = event.data.type == _DONE_EVENT_TYPE
+                except AttributeError:
+                    done = False
+                if done:
+                    actual = self._extract_usage(event.data)
+                    self._refund_tokens_async(estimated, actual)
+                yield event
+        except Exception as e:
+            raise self._handle_error(e) from e
 
     # ==================== START ====================
 
@@ -154,37 +374,28 @@ class RateLimitedConversations:
         http_headers: Mapping[str, str] | None = None,
     ) -> Any:
         """Start a new conversation (synchronous)."""
-        estimated = self._estimate_tokens(inputs) + 100
-        self._rate_limiter.acquire(request_tokens=1, token_count=estimated)
-
-        try:
-            kwargs = self._filter_none(
-                {
-                    "model": model,
-                    "agent_id": agent_id,
-                    "instructions": instructions,
-                    "tools": tools,
-                    "completion_args": completion_args,
-                    "store": store,
-                    "handoff_execution": handoff_execution,
-                    "metadata": metadata,
-                    "name": name,
-                    "description": description,
-                    "agent_version": agent_version,
-                    "retries": retries,
-                    "server_url": server_url,
-                    "timeout_ms": timeout_ms,
-                    "http_headers": http_headers,
-                }
-            )
-            kwargs["inputs"] = inputs
-            kwargs["stream"] = False
-            response = self._client.beta.conversations.start(**kwargs)
-            actual = self._extract_usage(response)
-            self._refund_tokens(estimated, actual)
-            return response
-        except Exception as e:
-            raise self._handle_error(e) from e
+        kwargs = _filter_none(
+            _START_PARAMS,
+            (
+                model,
+                agent_id,
+                instructions,
+                tools,
+                completion_args,
+                store,
+                handoff_execution,
+                metadata,
+                name,
+                description,
+                agent_version,
+                retries,
+                server_url,
+                timeout_ms,
+                http_headers,
+            ),
+        )
+        kwargs["inputs"] = inputs
+        return self._call(self._sdk_start, kwargs)
 
     async def start_async(
         self,
@@ -206,37 +417,28 @@ class RateLimitedConversations:
         http_headers: Mapping[str, str] | None = None,
     ) -> Any:
         """Start a new conversation (asynchronous)."""
-        estimated = self._estimate_tokens(inputs) + 100
-        await self._async_rate_limiter.acquire(request_tokens=1, token_count=estimated)
-
-        try:
-            kwargs = self._filter_none(
-                {
-                    "model": model,
-                    "agent_id": agent_id,
-                    "instructions": instructions,
-                    "tools": tools,
-                    "completion_args": completion_args,
-                    "store": store,
-                    "handoff_execution": handoff_execution,
-                    "metadata": metadata,
-                    "name": name,
-                    "description": description,
-                    "agent_version": agent_version,
-                    "retries": retries,
-                    "server_url": server_url,
-                    "timeout_ms": timeout_ms,
-                    "http_headers": http_headers,
-                }
-            )
-            kwargs["inputs"] = inputs
-            kwargs["stream"] = False
-            response = await self._client.beta.conversations.start_async(**kwargs)
-            actual = self._extract_usage(response)
-            await self._refund_tokens_async(estimated, actual)
-            return response
-        except Exception as e:
-            raise self._handle_error(e) from e
+        kwargs = _filter_none(
+            _START_PARAMS,
+            (
+                model,
+                agent_id,
+                instructions,
+                tools,
+                completion_args,
+                store,
+                handoff_execution,
+                metadata,
+                name,
+                description,
+                agent_version,
+                retries,
+                server_url,
+                timeout_ms,
+                http_headers,
+            ),
+        )
+        kwargs["inputs"] = inputs
+        return await self._call_async(self._sdk_start_async, kwargs)
 
     # ==================== START STREAM ====================
 
@@ -260,37 +462,30 @@ class RateLimitedConversations:
         http_headers: Mapping[str, str] | None = None,
     ) -> Iterator[Any]:
         """Start a conversation with streaming (synchronous)."""
-        estimated = self._estimate_tokens(inputs) + 100
-        self._rate_limiter.acquire(request_tokens=1, token_count=estimated)
-
-        try:
-            kwargs = self._filter_none(
-                {
-                    "model": model,
-                    "agent_id": agent_id,
-                    "instructions": instructions,
-                    "tools": tools,
-                    "completion_args": completion_args,
-                    "store": store,
-                    "handoff_execution": handoff_execution,
-                    "metadata": metadata,
-                    "name": name,
-                    "description": description,
-                    "agent_version": agent_version,
-                    "retries": retries,
-                    "server_url": server_url,
-                    "timeout_ms": timeout_ms,
-                    "http_headers": http_headers,
-                }
-            )
-            kwargs["inputs"] = inputs
-            kwargs["stream"] = True
-            stream = self._client.beta.conversations.start_stream(**kwargs)
-            yield from self._process_stream_response(stream, estimated)
-        except Exception as e:
-            raise self._handle_error(e) from e
+        kwargs = _filter_none(
+            _START_PARAMS,
+            (
+                model,
+                agent_id,
+                instructions,
+                tools,
+                completion_args,
+                store,
+                handoff_execution,
+                metadata,
+                name,
+                description,
+                agent_version,
+                retries,
+                server_url,
+                timeout_ms,
+                http_headers,
+            ),
+        )
+        kwargs["inputs"] = inputs
+        return self._stream(self._sdk_start_stream, kwargs)
 
-    async def start_stream_async(
+    def start_stream_async(
         self,
         inputs: Any,
         model: str | None = None,
@@ -310,36 +505,28 @@ class RateLimitedConversations:
         http_headers: Mapping[str, str] | None = None,
     ) -> AsyncIterator[Any]:
         """Start a conversation with streaming (asynchronous)."""
-        estimated = self._estimate_tokens(inputs) + 100
-        await self._async_rate_limiter.acquire(request_tokens=1, token_count=estimated)
-
-        try:
-            kwargs = self._filter_none(
-                {
-                    "model": model,
-                    "agent_id": agent_id,
-                    "instructions": instructions,
-                    "tools": tools,
-                    "completion_args": completion_args,
-                    "store": store,
-                    "handoff_execution": handoff_execution,
-                    "metadata": metadata,
-                    "name": name,
-                    "description": description,
-                    "agent_version": agent_version,
-                    "retries": retries,
-                    "server_url": server_url,
-                    "timeout_ms": timeout_ms,
-                    "http_headers": http_headers,
-                }
-            )
-            kwargs["inputs"] = inputs
-            kwargs["stream"] = True
-            stream = await self._client.beta.conversations.start_stream_async(**kwargs)
-            async for event in self._process_stream_response_async(stream, estimated):
-                yield event
-        except Exception as e:
-            raise self._handle_error(e) from e
+        kwargs = _filter_none(
+            _START_PARAMS,
+            (
+                model,
+                agent_id,
+                instructions,
+                tools,
+                completion_args,
+                store,
+                handoff_execution,
+                metadata,
+                name,
+                description,
+                agent_version,
+                retries,
+                server_url,
+                timeout_ms,
+                http_headers,
+            ),
+        )
+        kwargs["inputs"] = inputs
+        return self._stream_async(self._sdk_start_stream_async, kwargs)
 
     # ==================== APPEND ====================
 
@@ -356,30 +543,21 @@ class RateLimitedConversations:
         http_headers: Mapping[str, str] | None = None,
     ) -> Any:
         """Append new entries to an existing conversation (synchronous)."""
-        estimated = self._estimate_tokens(inputs) + 100
-        self._rate_limiter.acquire(request_tokens=1, token_count=estimated)
-
-        try:
-            kwargs = self._filter_none(
-                {
-                    "completion_args": completion_args,
-                    "store": store,
-                    "handoff_execution": handoff_execution,
-                    "retries": retries,
-                    "server_url": server_url,
-                    "timeout_ms": timeout_ms,
-                    "http_headers": http_headers,
-                }
-            )
-            kwargs["conversation_id"] = conversation_id
-            kwargs["inputs"] = inputs
-            kwargs["stream"] = False
-            response = self._client.beta.conversations.append(**kwargs)
-            actual = self._extract_usage(response)
-            self._refund_tokens(estimated, actual)
-            return response
-        except Exception as e:
-            raise self._handle_error(e) from e
+        kwargs = _filter_none(
+            _APPEND_PARAMS,
+            (
+                completion_args,
+                store,
+                handoff_execution,
+                retries,
+                server_url,
+                timeout_ms,
+                http_headers,
+            ),
+        )
+        kwargs["conversation_id"] = conversation_id
+        kwargs["inputs"] = inputs
+        return self._call(self._sdk_append, kwargs)
 
     async def append_async(
         self,
@@ -394,30 +572,21 @@ class RateLimitedConversations:
         http_headers: Mapping[str, str] | None = None,
     ) -> Any:
         """Append new entries to an existing conversation (asynchronous)."""
-        estimated = self._estimate_tokens(inputs) + 100
-        await self._async_rate_limiter.acquire(request_tokens=1, token_count=estimated)
-
-        try:
-            kwargs = self._filter_none(
-                {
-                    "completion_args": completion_args,
-                    "store": store,
-                    "handoff_execution": handoff_execution,
-                    "retries": retries,
-                    "server_url": server_url,
-                    "timeout_ms": timeout_ms,
-                    "http_headers": http_headers,
-                }
-            )
-            kwargs["conversation_id"] = conversation_id
-            kwargs["inputs"] = inputs
-            kwargs["stream"] = False
-            response = await self._client.beta.conversations.append_async(**kwargs)
-            actual = self._extract_usage(response)
-            await self._refund_tokens_async(estimated, actual)
-            return response
-        except Exception as e:
-            raise self._handle_error(e) from e
+        kwargs = _filter_none(
+            _APPEND_PARAMS,
+            (
+                completion_args,
+                store,
+                handoff_execution,
+                retries,
+                server_url,
+                timeout_ms,
+                http_headers,
+            ),
+        )
+        kwargs["conversation_id"] = conversation_id
+        kwargs["inputs"] = inputs
+        return await self._call_async(self._sdk_append_async, kwargs)
 
     # ==================== APPEND STREAM ====================
 
@@ -434,30 +603,23 @@ class RateLimitedConversations:
         http_headers: Mapping[str, str] | None = None,
     ) -> Iterator[Any]:
         """Append entries with streaming (synchronous)."""
-        estimated = self._estimate_tokens(inputs) + 100
-        self._rate_limiter.acquire(request_tokens=1, token_count=estimated)
-
-        try:
-            kwargs = self._filter_none(
-                {
-                    "completion_args": completion_args,
-                    "store": store,
-                    "handoff_execution": handoff_execution,
-                    "retries": retries,
-                    "server_url": server_url,
-                    "timeout_ms": timeout_ms,
-                    "http_headers": http_headers,
-                }
-            )
-            kwargs["conversation_id"] = conversation_id
-            kwargs["inputs"] = inputs
-            kwargs["stream"] = True
-            stream = self._client.beta.conversations.append_stream(**kwargs)
-            yield from self._process_stream_response(stream, estimated)
-        except Exception as e:
-            raise self._handle_error(e) from e
+        kwargs = _filter_none(
+            _APPEND_PARAMS,
+            (
+                completion_args,
+                store,
+                handoff_execution,
+                retries,
+                server_url,
+                timeout_ms,
+                http_headers,
+            ),
+        )
+        kwargs["conversation_id"] = conversation_id
+        kwargs["inputs"] = inputs
+        return self._stream(self._sdk_append_stream, kwargs)
 
-    async def append_stream_async(
+    def append_stream_async(
         self,
         conversation_id: str,
         inputs: Any,
@@ -470,29 +632,21 @@ class RateLimitedConversations:
         http_headers: Mapping[str, str] | None = None,
     ) -> AsyncIterator[Any]:
         """Append entries with streaming (asynchronous)."""
-        estimated = self._estimate_tokens(inputs) + 100
-        await self._async_rate_limiter.acquire(request_tokens=1, token_count=estimated)
-
-        try:
-            kwargs = self._filter_none(
-                {
-                    "completion_args": completion_args,
-                    "store": store,
-                    "handoff_execution": handoff_execution,
-                    "retries": retries,
-                    "server_url": server_url,
-                    "timeout_ms": timeout_ms,
-                    "http_headers": http_headers,
-                }
-            )
-            kwargs["conversation_id"] = conversation_id
-            kwargs["inputs"] = inputs
-            kwargs["stream"] = True
-            stream = await self._client.beta.conversations.append_stream_async(**kwargs)
-            async for event in self._process_stream_response_async(stream, estimated):
-                yield event
-        except Exception as e:
-            raise self._handle_error(e) from e
+        kwargs = _filter_none(
+            _APPEND_PARAMS,
+            (
+                completion_args,
+                store,
+                handoff_execution,
+                retries,
+                server_url,
+                timeout_ms,
+                http_headers,
+            ),
+        )
+        kwargs["conversation_id"] = conversation_id
+        kwargs["inputs"] = inputs
+        return self._stream_async(self._sdk_append_stream_async, kwargs)
 
     # ==================== RESTART ====================
 
@@ -512,33 +666,24 @@ class RateLimitedConversations:
         http_headers: Mapping[str, str] | None = None,
     ) -> Any:
         """Restart a conversation from a given entry (synchronous)."""
-        estimated = self._estimate_tokens(inputs) + 100
-        self._rate_limiter.acquire(request_tokens=1, token_count=estimated)
-
-        try:
-            kwargs = self._filter_none(
-                {
-                    "completion_args": completion_args,
-                    "store": store,
-                    "handoff_execution": handoff_execution,
-                    "metadata": metadata,
-                    "agent_version": agent_version,
-                    "retries": retries,
-                    "server_url": server_url,
-                    "timeout_ms": timeout_ms,
-                    "http_headers": http_headers,
-                }
-            )
-            kwargs["conversation_id"] = conversation_id
-            kwargs["from_entry_id"] = from_entry_id
-            kwargs["inputs"] = inputs
-            kwargs["stream"] = False
-            response = self._client.beta.conversations.restart(**kwargs)
-            actual = self._extract_usage(response)
-            self._refund_tokens(estimated, actual)
-            return response
-        except Exception as e:
-            raise self._handle_error(e) from e
+        kwargs = _filter_none(
+            _RESTART_PARAMS,
+            (
+                completion_args,
+                store,
+                handoff_execution,
+                metadata,
+                agent_version,
+                retries,
+                server_url,
+                timeout_ms,
+                http_headers,
+            ),
+        )
+        kwargs["conversation_id"] = conversation_id
+        kwargs["from_entry_id"] = from_entry_id
+        kwargs["inputs"] = inputs
+        return self._call(self._sdk_restart, kwargs)
 
     async def restart_async(
         self,
@@ -556,33 +701,24 @@ class RateLimitedConversations:
         http_headers: Mapping[str, str] | None = None,
     ) -> Any:
         """Restart a conversation from a given entry (asynchronous)."""
-        estimated = self._estimate_tokens(inputs) + 100
-        await self._async_rate_limiter.acquire(request_tokens=1, token_count=estimated)
-
-        try:
-            kwargs = self._filter_none(
-                {
-                    "completion_args": completion_args,
-                    "store": store,
-                    "handoff_execution": handoff_execution,
-                    "metadata": metadata,
-                    "agent_version": agent_version,
-                    "retries": retries,
-                    "server_url": server_url,
-                    "timeout_ms": timeout_ms,
-                    "http_headers": http_headers,
-                }
-            )
-            kwargs["conversation_id"] = conversation_id
-            kwargs["from_entry_id"] = from_entry_id
-            kwargs["inputs"] = inputs
-            kwargs["stream"] = False
-            response = await self._client.beta.conversations.restart_async(**kwargs)
-            actual = self._extract_usage(response)
-            await self._refund_tokens_async(estimated, actual)
-            return response
-        except Exception as e:
-            raise self._handle_error(e) from e
+        kwargs = _filter_none(
+            _RESTART_PARAMS,
+            (
+                completion_args,
+                store,
+                handoff_execution,
+                metadata,
+                agent_version,
+                retries,
+                server_url,
+                timeout_ms,
+                http_headers,
+            ),
+        )
+        kwargs["conversation_id"] = conversation_id
+        kwargs["from_entry_id"] = from_entry_id
+        kwargs["inputs"] = inputs
+        return await self._call_async(self._sdk_restart_async, kwargs)
 
     # ==================== RESTART STREAM ====================
 
@@ -602,33 +738,26 @@ class RateLimitedConversations:
         http_headers: Mapping[str, str] | None = None,
     ) -> Iterator[Any]:
         """Restart a conversation with streaming (synchronous)."""
-        estimated = self._estimate_tokens(inputs) + 100
-        self._rate_limiter.acquire(request_tokens=1, token_count=estimated)
-
-        try:
-            kwargs = self._filter_none(
-                {
-                    "completion_args": completion_args,
-                    "store": store,
-                    "handoff_execution": handoff_execution,
-                    "metadata": metadata,
-                    "agent_version": agent_version,
-                    "retries": retries,
-                    "server_url": server_url,
-                    "timeout_ms": timeout_ms,
-                    "http_headers": http_headers,
-                }
-            )
-            kwargs["conversation_id"] = conversation_id
-            kwargs["from_entry_id"] = from_entry_id
-            kwargs["inputs"] = inputs
-            kwargs["stream"] = True
-            stream = self._client.beta.conversations.restart_stream(**kwargs)
-            yield from self._process_stream_response(stream, estimated)
-        except Exception as e:
-            raise self._handle_error(e) from e
+        kwargs = _filter_none(
+            _RESTART_PARAMS,
+            (
+                completion_args,
+                store,
+                handoff_execution,
+                metadata,
+                agent_version,
+                retries,
+                server_url,
+                timeout_ms,
+                http_headers,
+            ),
+        )
+        kwargs["conversation_id"] = conversation_id
+        kwargs["from_entry_id"] = from_entry_id
+        kwargs["inputs"] = inputs
+        return self._stream(self._sdk_restart_stream, kwargs)
 
-    async def restart_stream_async(
+    def restart_stream_async(
         self,
         conversation_id: str,
         from_entry_id: str,
@@ -644,131 +773,121 @@ class RateLimitedConversations:
         http_headers: Mapping[str, str] | None = None,
     ) -> AsyncIterator[Any]:
         """Restart a conversation with streaming (asynchronous)."""
-        estimated = self._estimate_tokens(inputs) + 100
-        await self._async_rate_limiter.acquire(request_tokens=1, token_count=estimated)
-
-        try:
-            kwargs = self._filter_none(
-                {
-                    "completion_args": completion_args,
-                    "store": store,
-                    "handoff_execution": handoff_execution,
-                    "metadata": metadata,
-                    "agent_version": agent_version,
-                    "retries": retries,
-                    "server_url": server_url,
-                    "timeout_ms": timeout_ms,
-                    "http_headers": http_headers,
-                }
-            )
-            kwargs["conversation_id"] = conversation_id
-            kwargs["from_entry_id"] = from_entry_id
-            kwargs["inputs"] = inputs
-            kwargs["stream"] = True
-            stream = await self._client.beta.conversations.restart_stream_async(**kwargs)
-            async for event in self._process_stream_response_async(stream, estimated):
-                yield event
-        except Exception as e:
-            raise self._handle_error(e) from e
+        kwargs = _filter_none(
+            _RESTART_PARAMS,
+            (
+                completion_args,
+                store,
+                handoff_execution,
+                metadata,
+                agent_version,
+                retries,
+                server_url,
+                timeout_ms,
+                http_headers,
+            ),
+        )
+        kwargs["conversation_id"] = conversation_id
+        kwargs["from_entry_id"] = from_entry_id
+        kwargs["inputs"] = inputs
+        return self._stream_async(self._sdk_restart_stream_async, kwargs)
 
     # ==================== GETTERS & HELPERS ====================
 
     def get(self, conversation_id: str, **kwargs: Any) -> Any:
         """Get conversation information."""
-        self._rate_limiter.acquire(request_tokens=1, token_count=50)
+        self._acquire(request_tokens=1, token_count=50)
         try:
-            return self._client.beta.conversations.get(conversation_id=conversation_id, **kwargs)
+            return self._sdk_get(conversation_id=conversation_id, **kwargs)
         except Exception as e:
             raise self._handle_error(e) from e
 
     async def get_async(self, conversation_id: str, **kwargs: Any) -> Any:
         """Get conversation information (async)."""
-        await self._async_rate_limiter.acquire(request_tokens=1, token_count=50)
+        await self._acquire_async(request_tokens=1, token_count=50)
         try:
-            return await self._client.beta.conversations.get_async(
-                conversation_id=conversation_id, **kwargs
-            )
+            return await self._sdk_get_async(conversation_id=conversation_id, **kwargs)
         except Exception as e:
             raise self._handle_error(e) from e
 
     def get_history(self, conversation_id: str, **kwargs: Any) -> Any:
         """Get all entries in a conversation."""
-        self._rate_limiter.acquire(request_tokens=1, token_count=50)
+        self._acquire(request_tokens=1, token_count=50)
         try:
-            return self._client.beta.conversations.get_history(
-                conversation_id=conversation_id, **kwargs
-            )
+            return self._sdk_get_history(conversation_id=conversation_id, **kwargs)
         except Exception as e:
             raise self._handle_error(e) from e
 
     async def get_history_async(self, conversation_id: str, **kwargs: Any) -> Any:
         """Get all entries in a conversation (async)."""
-        await self._async_rate_limiter.acquire(request_tokens=1, token_count=50)
+        await self._acquire_async(request_tokens=1, token_count=50)
         try:
-            return await self._client.beta.conversations.get_history_async(
-                conversation_id=conversation_id, **kwargs
-            )
+            return await self._sdk_get_history_async(conversation_id=conversation_id, **kwargs)
         except Exception as e:
             raise self._handle_error(e) from e
 
     def get_messages(self, conversation_id: str, **kwargs: Any) -> Any:
         """Get all messages in a conversation."""
-        self._rate_limiter.acquire(request_tokens=1, token_count=50)
+        self._acquire(request_tokens=1, token_count=50)
         try:
-            return self._client.beta.conversations.get_messages(
-                conversation_id=conversation_id, **kwargs
-            )
+            return self._sdk_get_messages(conversation_id=conversation_id, **kwargs)
         except Exception as e:
             raise self._handle_error(e) from e
 
     async def get_messages_async(self, conversation_id: str, **kwargs: Any) -> Any:
         """Get all messages in a conversation (async)."""
-        await self._async_rate_limiter.acquire(request_tokens=1, token_count=50)
+        await self._acquire_async(request_tokens=1, token_count=50)
         try:
-            return await self._client.beta.conversations.get_messages_async(
-                conversation_id=conversation_id, **kwargs
-            )
+            return await self._sdk_get_messages_async(conversation_id=conversation_id, **kwargs)
         except Exception as e:
             raise self._handle_error(e) from e
 
     def list(self, page: int = 0, page_size: int = 100, **kwargs: Any) -> Any:
         """List all conversations."""
-        self._rate_limiter.acquire(request_tokens=1, token_count=50)
+        self._acquire(request_tokens=1, token_count=50)
         try:
-            return self._client.beta.conversations.list(page=page, page_size=page_size, **kwargs)
+            return self._sdk_list(page=page, page_size=page_size, **kwargs)
         except Exception as e:
             raise self._handle_error(e) from e
 
     async def list_async(self, page: int = 0, page_size: int = 100, **kwargs: Any) -> Any:
         """List all conversations (async)."""
-        await self._async_rate_limiter.acquire(request_tokens=1, token_count=50)
+        await self._acquire_async(request_tokens=1, token_count=50)
         try:
-            return await self._client.beta.conversations.list_async(
-                page=page, page_size=page_size, **kwargs
-            )
+            return await self._sdk_list_async(page=page, page_size=page_size, **kwargs)
         except Exception as e:
             raise self._handle_error(e) from e
 
     def delete(self, conversation_id: str, **kwargs: Any) -> Any:
         """Delete a conversation."""
-        self._rate_limiter.acquire(request_tokens=1, token_count=10)
+        self._acquire(request_tokens=1, token_count=10)
         try:
-            return self._client.beta.conversations.delete(conversation_id=conversation_id, **kwargs)
+            return self._sdk_delete(conversation_id=conversation_id, **kwargs)
         except Exception as e:
             raise self._handle_error(e) from e
 
     async def delete_async(self, conversation_id: str, **kwargs: Any) -> Any:
         """Delete a conversation (async)."""
-        await self._async_rate_limiter.acquire(request_tokens=1, token_count=10)
+        await self._acquire_async(request_tokens=1, token_count=10)
         try:
-            return await self._client.beta.conversations.delete_async(
-                conversation_id=conversation_id, **kwargs
-            )
+            return await self._sdk_delete_async(conversation_id=conversation_id, **kwargs)
         except Exception as e:
             raise self._handle_error(e) from e
 
     def _handle_error(self, error: Exception) -> Exception:
         """Handle and transform errors."""
+        # SDK errors carry the HTTP status; only untyped errors fall back to
+        # searching the message text.
+        status_code = getattr(error, "status_code", None)
+        if status_code is not None:
+            if status_code == 429:
+                return RateLimitExceeded(
+                    f"Rate limit exceeded: {error}",
+                    retry_after=_retry_after(error),
+                    limit_type="requests",
+                )
+            return MistralRatelimitError(f"API error: {error}")
+
         error_str = str(error).lower()
         if "429" in error_str or "rate limit" in error_str:
             return RateLimitExceeded(
@@ -781,6 +900,26 @@ class RateLimitedConversations:
 class RateLimitedAgents:
     """Rate-limited wrapper for Mistral beta.agents API."""
 
+    __slots__ = (
+        "_client",
+        "_rate_limiter",
+        "_async_rate_limiter",
+        "_token_counter",
+        "_config",
+        "_acquire",
+        "_acquire_async",
+        "_sdk_list",
+        "_sdk_list_async",
+        "_sdk_get",
+        "_sdk_get_async",
+        "_sdk_create",
+        "_sdk_create_async",
+        "_sdk_update",
+        "_sdk_update_async",
+        "_sdk_delete",
+        "_sdk_delete_async",
+    )
+
     def __init__(
         self,
         client: Mistral,
@@ -795,45 +934,62 @@ class RateLimitedAgents:
         self._token_counter = token_counter
         self._config = config
 
+        # Bound once; acquire runs before every request
+        self._acquire = rate_limiter.acquire
+        self._acquire_async = async_rate_limiter.acquire
+
+        # Resolve SDK operations once rather than walking client.beta.agents per call
+        agents = client.beta.agents
+        self._sdk_list = agents.list
+        self._sdk_list_async = agents.list_async
+        self._sdk_get = agents.get
+        self._sdk_get_async = agents.get_async
+        self._sdk_create = agents.create
+        self._sdk_create_async = agents.create_async
+        self._sdk_update = agents.update
+        self._sdk_update_async = agents.update_async
+        self._sdk_delete = agents.delete
+        self._sdk_delete_async = agents.delete_async
+
     def list(self, page: int = 0, page_size: int = 100, **kwargs: Any) -> Any:
-        self._rate_limiter.acquire(request_tokens=1, token_count=50)
-        return self._client.beta.agents.list(page=page, page_size=page_size, **kwargs)
+        self._acquire(request_tokens=1, token_count=50)
+        return self._sdk_list(page=page, page_size=page_size, **kwargs)
 
     async def list_async(self, page: int = 0, page_size: int = 100, **kwargs: Any) -> Any:
-        await self._async_rate_limiter.acquire(request_tokens=1, token_count=50)
-        return await self._client.beta.agents.list_async(page=page, page_size=page_size, **kwargs)
+        await self._acquire_async(request_tokens=1, token_count=50)
+        return await self._sdk_list_async(page=page, page_size=page_size, **kwargs)
 
     def get(self, agent_id: str, **kwargs: Any) -> Any:
-        self._rate_limiter.acquire(request_tokens=1, token_count=50)
-        return self._client.beta.agents.get(agent_id=agent_id, **kwargs)
+        self._acquire(request_tokens=1, token_count=50)
+        return self._sdk_get(agent_id=agent_id, **kwargs)
 
     async def get_async(self, agent_id: str, **kwargs: Any) -> Any:
-        await self._async_rate_limiter.acquire(request_tokens=1, token_count=50)
-        return await self._client.beta.agents.get_async(agent_id=agent_id, **kwargs)
+        await self._acquire_async(request_tokens=1, token_count=50)
+        return await self._sdk_get_async(agent_id=agent_id, **kwargs)
 
     def create(self, **kwargs: Any) -> Any:
-        self._rate_limiter.acquire(request_tokens=1, token_count=100)
-        return self._client.beta.agents.create(**kwargs)
+        self._acquire(request_tokens=1, token_count=100)
+        return self._sdk_create(**kwargs)
 
     async def create_async(self, **kwargs: Any) -> Any:
-        await self._async_rate_limiter.acquire(request_tokens=1, token_count=100)
-        return await self._client.beta.agents.create_async(**kwargs)
+        await self._acquire_async(request_tokens=1, token_count=100)
+        return await self._sdk_create_async(**kwargs)
 
     def update(self, agent_id: str, **kwargs: Any) -> Any:
-        self._rate_limiter.acquire(request_tokens=1, token_count=100)
-        return self._client.beta.agents.update(agent_id=agent_id, **kwargs)
+        self._acquire(request_tokens=1, token_count=100)
+        return self._sdk_update(agent_id=agent_id, **kwargs)
 
     async def update_async(self, agent_id: str, **kwargs: Any) -> Any:
-        await self._async_rate_limiter.acquire(request_tokens=1, token_count=100)
-        return await self._client.beta.agents.update_async(agent_id=agent_id, **kwargs)
+        await self._acquire_async(request_tokens=1, token_count=100)
+        return await self._sdk_update_async(agent_id=agent_id, **kwargs)
 
     def delete(self, agent_id: str, **kwargs: Any) -> Any:
-        self._rate_limiter.acquire(request_tokens=1, token_count=10)
-        return self._client.beta.agents.delete(agent_id=agent_id, **kwargs)
+        self._acquire(request_tokens=1, token_count=10)
+        return self._sdk_delete(agent_id=agent_id, **kwargs)
 
     async def delete_async(self, agent_id: str, **kwargs: Any) -> Any:
-        await self._async_rate_limiter.acquire(request_tokens=1, token_count=10)
-        return await self._client.beta.agents.delete_async(agent_id=agent_id, **kwargs)
+        await self._acquire_async(request_tokens=1, token_count=10)
+        return await self._sdk_delete_async(agent_id=agent_id, **kwargs)
 
 
 class MistralRatelimitClient:
@@ -846,17 +1002,17 @@ class MistralRatelimitClient:
             config: Rate limit configuration
         """
         self._config = config
-        self._token_counter = TokenCounter()
-
-        # Initialize rate limiters
-        self._rate_limiter = RateLimiter(
-            requests_per_second=config.requests_per_second,
-            tokens_per_minute=config.tokens_per_minute,
-        )
-        self._async_rate_limiter = AsyncRateLimiter(
-            requests_per_second=config.requests_per_second,
-            tokens_per_minute=config.tokens_per_minute,
+        self._token_counter = TokenCounter(backend=config.tokenizer_backend)
+
+        # Initialize rate limiters. Both draw from one pair of buckets, so mixing
+        # the sync and async APIs cannot exceed the per-key quota.
+        buckets = RateLimitBuckets(
+            config.requests_per_second,
+            config.tokens_per_minute,
+            shared=config.shared,
         )
+        self._rate_limiter = RateLimiter(buckets=buckets, jitter=config.jitter)
+        self._async_rate_limiter = AsyncRateLimiter(buckets=buckets, jitter=config.jitter)
 
         # Initialize the official Mistral SDK client
         self._client = Mistral(api_key=config.api_key)
@@ -879,6 +1035,8 @@ class MistralRatelimitClient:
 class _BetaNamespace:
     """Namespace for beta API wrappers."""
 
+    __slots__ = ("conversations", "agents")
+
     def __init__(
         self,
         client: Mistral,
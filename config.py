@@ -1,12 +1,16 @@
 """Configuration for mistral-ratelimit."""
 
+import os
 from dataclasses import dataclass
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class RatelimitConfig:
     """Configuration for the rate-limited Mistral client.
 
+    Instances are immutable: they are validated once on construction, and use
+    dataclasses.replace() to derive a modified copy.
+
     Attributes:
         api_key: Mistral API key (required). Can also be set via MISTRAL_API_KEY env var.
         requests_per_second: Maximum requests per second (default: 10.0)
@@ -15,6 +19,15 @@ class RatelimitConfig:
         base_delay: Base delay for exponential backoff in seconds (default: 1.0)
         max_delay: Maximum delay between retries in seconds (default: 32.0)
         timeout: Request timeout in seconds (default: 60.0)
+        tokenizer_backend: Tokenizer used when accurate_estimation is set, "tiktoken" or
+            "hf_fast" (requires the optional `tokenizers` package); loaded on first
+            use and ignored otherwise (default: "tiktoken")
+        accurate_estimation: Run the tokenizer to estimate request tokens instead of a
+            byte-length heuristic; usage is reconciled either way (default: False)
+        jitter: Stretch each rate-limit wait by a random 0-50% so callers that were
+            queued together do not all wake at once (default: False)
+        shared: Keep rate-limit state in shared memory so worker processes forked
+            after the client is created draw from one quota (default: False)
     """
 
     api_key: str | None = None
@@ -24,14 +37,16 @@ class RatelimitConfig:
     base_delay: float = 1.0
     max_delay: float = 32.0
     timeout: float = 60.0
+    tokenizer_backend: str = "tiktoken"
+    accurate_estimation: bool = False
+    jitter: bool = False
+    shared: bool = False
 
     def __post_init__(self):
         """Validate configuration after initialization."""
-        import os
-
         # Auto-load API key from environment if not provided
         if self.api_key is None:
-            self.api_key = os.environ.get("MISTRAL_API_KEY")
+            object.__setattr__(self, "api_key", os.environ.get("MISTRAL_API_KEY"))
 
         if self.api_key is None:
             raise ValueError(
@@ -55,3 +70,6 @@ class RatelimitConfig:
 
         if self.timeout <= 0:
             raise ValueError("timeout must be positive")
+
+        if self.tokenizer_backend not in ("tiktoken", "hf_fast"):
+            raise ValueError("tokenizer_backend must be 'tiktoken' or 'hf_fast'")
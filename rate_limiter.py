@@ -1,12 +1,18 @@
 """Rate limiter using token bucket algorithm."""
 
 import asyncio
+import multiprocessing
+import os
+import random
 import time
 import threading
-from dataclasses import dataclass
+import weakref
+from collections import deque
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
 
 
-@dataclass
+@dataclass(slots=True)
 class RateLimitState:
     """State for a single rate limit bucket.
 
@@ -14,116 +20,328 @@ class RateLimitState:
         available: Current available tokens
         max_tokens: Maximum token capacity
         refill_rate: Tokens added per second
-        last_update: Timestamp of last update
+        last_update_ns: time.monotonic_ns() timestamp of last update
+        inv_refill_rate: Seconds per token (1 / refill_rate), precomputed so wait
+            calculations multiply instead of divide
     """
 
     available: float
     max_tokens: float
     refill_rate: float
-    last_update: float
+    last_update_ns: int
+    inv_refill_rate: float = field(init=False)
 
+    def __post_init__(self) -> None:
+        self.inv_refill_rate = 1.0 / self.refill_rate
 
-class RateLimiter:
-    """Thread-safe rate limiter using token bucket algorithm.
 
-    Supports two independent limits:
-    - Requests per second (for controlling request rate)
-    - Tokens per minute (for controlling token usage)
+class SharedRateLimitState:
+    """RateLimitState whose mutable fields live in shared memory.
 
-    Uses token bucket for both, which allows burst handling while
-    maintaining average rate.
+    Processes forked after construction inherit the same memory, so they all
+    draw from one bucket. Reads and writes must happen under a
+    multiprocessing lock.
+
+    Attributes:
+        available: Current available tokens
+        max_tokens: Maximum token capacity
+        refill_rate: Tokens added per second
+        last_update_ns: time.monotonic_ns() timestamp of last update
+        inv_refill_rate: Seconds per token (1 / refill_rate)
     """
 
+    __slots__ = ("_available", "max_tokens", "refill_rate", "_last_update_ns", "inv_refill_rate")
+
     def __init__(
         self,
-        requests_per_second: float = 10.0,
-        tokens_per_minute: int = 100_000,
+        available: float,
+        max_tokens: float,
+        refill_rate: float,
+        last_update_ns: int,
     ):
-        """Initialize rate limiter.
+        self._available = multiprocessing.RawValue("d", available)
+        self.max_tokens = max_tokens
+        self.refill_rate = refill_rate
+        self._last_update_ns = multiprocessing.RawValue("q", last_update_ns)
+        self.inv_refill_rate = 1.0 / refill_rate
+
+    @property
+    def available(self) -> float:
+        return self._available.value
+
+    @available.setter
+    def available(self, value: float) -> None:
+        self._available.value = value
+
+    @property
+    def last_update_ns(self) -> int:
+        return self._last_update_ns.value
+
+    @last_update_ns.setter
+    def last_update_ns(self, value: int) -> None:
+        self._last_update_ns.value = value
+
+
+def _reserve(
+    request_bucket: RateLimitState | SharedRateLimitState,
+    token_bucket: RateLimitState | SharedRateLimitState,
+    request_tokens: float,
+    token_count: float,
+) -> float:
+    """Reserve tokens from both buckets and return the single wait covering both.
+
+    Buckets may go negative; the deficit is the caller's place in line. Both
+    buckets keep refilling during one sleep, so sleeping for the larger of the
+    two waits satisfies both. Must be called under the buckets' lock.
+
+    Args:
+        request_bucket: Request-rate bucket
+        token_bucket: Token-rate bucket
+        request_tokens: Tokens to take from the request bucket
+        token_count: Tokens to take from the token bucket
+
+    Returns:
+        Seconds to sleep before the request may proceed
+    """
+    request_bucket.available -= request_tokens
+    token_bucket.available -= token_count
+    return max(
+        0.0,
+        -request_bucket.available * request_bucket.inv_refill_rate,
+        -token_bucket.available * token_bucket.inv_refill_rate,
+    )
+
+
+class RateLimitBuckets:
+    """The request and token buckets behind a RateLimiter/AsyncRateLimiter pair.
+
+    Mistral enforces RPS/TPM per API key, so a client that uses both the sync and
+    async APIs must draw from one quota. Every bucket update happens under
+    ``lock`` (a threading.Lock).
+
+    With ``shared=True`` the buckets live in shared memory behind a
+    multiprocessing.Lock, so worker processes forked after construction (e.g.
+    gunicorn --preload, or the "fork" start method) share one quota. Processes
+    started with "spawn" get fresh buckets and are not covered.
+    """
+
+    def __init__(
+        self,
+        requests_per_second: float,
+        tokens_per_minute: int,
+        shared: bool = False,
+    ):
+        """Initialize both buckets full.
 
         Args:
             requests_per_second: Maximum requests per second
             tokens_per_minute: Maximum tokens per minute
+            shared: Keep bucket state in shared memory for forked worker processes
         """
+        now = time.monotonic_ns()
+        state = SharedRateLimitState if shared else RateLimitState
+
         # Request limiter: capacity = refill_rate (allows 1 burst)
-        self._request_bucket = RateLimitState(
+        self.request_bucket = state(
             available=requests_per_second,
             max_tokens=requests_per_second,
             refill_rate=requests_per_second,
-            last_update=time.monotonic(),
+            last_update_ns=now,
         )
 
         # Token limiter: convert to per-second rate
-        tokens_per_second = tokens_per_minute / 60.0
-        self._token_bucket = RateLimitState(
+        self.token_bucket = state(
             available=tokens_per_minute,
             max_tokens=tokens_per_minute,
-            refill_rate=tokens_per_second,
-            last_update=time.monotonic(),
+            refill_rate=tokens_per_minute / 60.0,
+            last_update_ns=now,
         )
 
-        self._lock = threading.Lock()
-
-    def _refill(self, bucket: RateLimitState) -> None:
+        self.lock = multiprocessing.Lock() if shared else threading.Lock()
+
+        # Refunds are queued without taking a lock (deque.append is atomic)
+        # and applied to the token bucket on the next locked operation. The
+        # queue is per process even when the buckets are shared; a forked child
+        # starts with an empty one (see _clear_inherited_refunds).
+        self._pending_refunds: deque[float] = deque()
+        if shared:
+            _SHARED_BUCKETS.add(self)
+
+    def _apply_pending_refunds(self) -> None:
+        """Move queued refunds into the token bucket. Must be called under the lock."""
+        pending = self._pending_refunds
+        if not pending:
+            return
+        refunded = 0.0
+        while pending:
+            refunded += pending.popleft()
+        bucket = self.token_bucket
+        bucket.available = min(bucket.max_tokens, bucket.available + refunded)
+
+    def _refill(
+        self,
+        bucket: RateLimitState | SharedRateLimitState,
+        now: int,
+        _min: Callable[[float, float], float] = min,
+    ) -> None:
         """Refill tokens in a bucket based on elapsed time.
 
         Args:
             bucket: The bucket to refill
+            now: Current time.monotonic_ns() reading, shared by both buckets
         """
-        now = time.monotonic()
-        elapsed = now - bucket.last_update
+        # min is bound as a default argument so this hot path reads it as a fast
+        # local instead of a builtin global. Timestamps are integer nanoseconds,
+        # which stay exact however long the process runs.
+        elapsed = (now - bucket.last_update_ns) * 1e-9
 
         # Add tokens based on elapsed time
         new_tokens = elapsed * bucket.refill_rate
-        bucket.available = min(bucket.max_tokens, bucket.available + new_tokens)
-        bucket.last_update = now
+        bucket.available = _min(bucket.max_tokens, bucket.available + new_tokens)
+        bucket.last_update_ns = now
 
-    def _acquire_request(self, tokens: int = 1) -> float:
-        """Acquire tokens from request bucket.
+    def reserve(
+        self,
+        request_tokens: float,
+        token_count: float,
+        _monotonic_ns: Callable[[], int] = time.monotonic_ns,
+    ) -> float:
+        """Refill both buckets and reserve tokens from them.
+
+        Tokens are reserved up front, driving a bucket negative if needed, so the
+        lock is held only for the arithmetic and each caller sleeps for its own
+        place in line outside of it. That is a few float operations, so the async
+        limiter takes the threading lock directly from the event loop.
 
         Args:
-            tokens: Number of tokens to acquire
+            request_tokens: Tokens to take from the request bucket
+            token_count: Tokens to take from the token bucket
 
         Returns:
-            Time waited (0 if acquired immediately)
+            Seconds the caller must sleep before proceeding
         """
-        self._refill(self._request_bucket)
-
-        if self._request_bucket.available >= tokens:
-            self._request_bucket.available -= tokens
-            return 0.0
+        with self.lock:
+            request_bucket = self.request_bucket
+            # One clock read covers both buckets
+            now = _monotonic_ns()
+            self._refill(request_bucket, now)
+
+            if not token_count:
+                # Request-only call: the token bucket refills lazily, so leaving
+                # it (and any queued refunds) for the next caller loses nothing.
+                available = request_bucket.available - request_tokens
+                request_bucket.available = available
+                return 0.0 if available >= 0 else -available * request_bucket.inv_refill_rate
+
+            token_bucket = self.token_bucket
+            self._refill(token_bucket, now)
+            self._apply_pending_refunds()
+
+            # Common case: both buckets cover the request, so there is no wait to compute
+            if request_tokens <= request_bucket.available and token_count <= token_bucket.available:
+                request_bucket.available -= request_tokens
+                token_bucket.available -= token_count
+                return 0.0
+
+            return _reserve(request_bucket, token_bucket, request_tokens, token_count)
+
+    def refund(self, tokens: float) -> None:
+        """Queue tokens to return to the token bucket (negative to charge).
 
-        # Calculate wait time for tokens to become available
-        needed = tokens - self._request_bucket.available
-        wait_time = needed / self._request_bucket.refill_rate
-
-        return wait_time
+        Args:
+            tokens: Number of tokens to return
+        """
+        self._pending_refunds.append(tokens)
 
-    def _acquire_token(self, tokens: int = 1) -> float:
-        """Acquire tokens from token bucket.
+    def wait_time(self, request_tokens: float, token_count: float) -> float:
+        """Calculate the wait for a request without reserving anything.
 
         Args:
-            tokens: Number of tokens to acquire
+            request_tokens: Tokens to check in request bucket
+            token_count: Tokens to check in token bucket
 
         Returns:
-            Time waited (0 if acquired immediately)
+            Estimated wait time in seconds
         """
-        self._refill(self._token_bucket)
+        with self.lock:
+            now = time.monotonic_ns()
+            self._refill(self.request_bucket, now)
+            self._refill(self.token_bucket, now)
+            self._apply_pending_refunds()
+
+            wait_request = 0.0
+            if self.request_bucket.available < request_tokens:
+                needed = request_tokens - self.request_bucket.available
+                wait_request = needed * self.request_bucket.inv_refill_rate
+
+            wait_token = 0.0
+            if self.token_bucket.available < token_count:
+                needed = token_count - self.token_bucket.available
+                wait_token = needed * self.token_bucket.inv_refill_rate
+
+            return max(wait_request, wait_token)
+
+
+# Shared buckets created in this process, tracked so a forked child can drop the
+# refunds it inherited: the parent still applies them to the same shared memory.
+_SHARED_BUCKETS: weakref.WeakSet[RateLimitBuckets] = weakref.WeakSet()
+
 
-        if self._token_bucket.available >= tokens:
-            self._token_bucket.available -= tokens
-            return 0.0
+def _clear_inherited_refunds() -> None:
+    """Empty the refund queues of shared buckets in a freshly forked child."""
+    for buckets in _SHARED_BUCKETS:
+        buckets._pending_refunds.clear()
 
-        # Calculate wait time for tokens to become available
-        needed = tokens - self._token_bucket.available
-        wait_time = needed / self._token_bucket.refill_rate
 
-        return wait_time
+if hasattr(os, "register_at_fork"):  # POSIX only; there is no fork to guard elsewhere
+    os.register_at_fork(after_in_child=_clear_inherited_refunds)
 
-    def acquire(self, request_tokens: int = 1, token_count: int = 0) -> float:
+
+class RateLimiter:
+    """Thread-safe rate limiter using token bucket algorithm.
+
+    Supports two independent limits:
+    - Requests per second (for controlling request rate)
+    - Tokens per minute (for controlling token usage)
+
+    Uses token bucket for both, which allows burst handling while
+    maintaining average rate.
+    """
+
+    def __init__(
+        self,
+        requests_per_second: float = 10.0,
+        tokens_per_minute: int = 100_000,
+        buckets: RateLimitBuckets | None = None,
+        jitter: bool = False,
+    ):
+        """Initialize rate limiter.
+
+        Args:
+            requests_per_second: Maximum requests per second
+            tokens_per_minute: Maximum tokens per minute
+            buckets: Buckets shared with an AsyncRateLimiter. When given, the
+                two limits above are ignored in favor of the buckets' own.
+            jitter: Stretch each wait by a random 0-50%
+        """
+        if buckets is None:
+            buckets = RateLimitBuckets(requests_per_second, tokens_per_minute)
+        self._buckets = buckets
+        self._reserve = buckets.reserve
+        self._jitter = jitter
+
+    def acquire(
+        self,
+        request_tokens: int = 1,
+        token_count: int = 0,
+        _sleep: Callable[[float], None] = time.sleep,
+        _random: Callable[[], float] = random.random,
+    ) -> float:
         """Acquire from both rate limits.
 
-        Blocks until both limits allow the request.
+        Blocks until both limits allow the request. With jitter enabled the
+        wait is stretched by a random 0-50%; it is never shortened, since the
+        tokens are already reserved and waking early would exceed the limit.
 
         Args:
             request_tokens: Tokens to acquire from request bucket (default: 1)
@@ -132,31 +350,27 @@ class RateLimiter:
         Returns:
             Total time waited in seconds
         """
-        total_wait = 0.0
+        wait = self._reserve(request_tokens, token_count)
 
-        with self._lock:
-            # Acquire from request bucket
-            wait = self._acquire_request(request_tokens)
-            total_wait += wait
+        if wait > 0:
+            if self._jitter:
+                wait += wait * 0.5 * _random()
+            _sleep(wait)
 
-            if wait > 0:
-                # Need to wait - update time and retry
-                time.sleep(wait)
-                # Re-acquire after waiting
-                self._refill(self._request_bucket)
-                self._request_bucket.available -= request_tokens
+        return wait
 
-            # Acquire from token bucket
-            wait = self._acquire_token(token_count)
-            total_wait += wait
+    def refund(self, tokens: float) -> None:
+        """Return unused tokens to the token bucket.
 
-            if wait > 0:
-                time.sleep(wait)
-                # Re-acquire after waiting
-                self._refill(self._token_bucket)
-                self._token_bucket.available -= token_count
+        Used to give back the difference between an estimated token count and
+        the actual usage reported by the API. The bucket never exceeds capacity.
+        A negative value charges tokens that the estimate missed. The refund is
+        applied by the next acquire or get_wait_time call.
 
-        return total_wait
+        Args:
+            tokens: Number of tokens to return (negative to charge)
+        """
+        self._buckets.refund(tokens)
 
     def get_wait_time(
         self,
@@ -174,72 +388,49 @@ class RateLimiter:
         Returns:
             Estimated wait time in seconds
         """
-        with self._lock:
-            self._refill(self._request_bucket)
-            self._refill(self._token_bucket)
-
-            wait_request = 0.0
-            if self._request_bucket.available < request_tokens:
-                needed = request_tokens - self._request_bucket.available
-                wait_request = needed / self._request_bucket.refill_rate
-
-            wait_token = 0.0
-            if self._token_bucket.available < token_count:
-                needed = token_count - self._token_bucket.available
-                wait_token = needed / self._token_bucket.refill_rate
-
-            return max(wait_request, wait_token)
+        return self._buckets.wait_time(request_tokens, token_count)
 
 
 class AsyncRateLimiter:
     """Async version of RateLimiter.
 
-    Same functionality but uses asyncio.Lock for thread safety
-    in async contexts.
+    Same functionality, but waits with asyncio.sleep. Reserving tokens never
+    suspends, so no asyncio.Lock is needed and the limiter is not tied to any
+    one event loop.
+
+    Mistral enforces RPS/TPM per API key, not per agent or conversation, so all
+    requests draw from the same pair of buckets. Pass the RateLimiter's buckets
+    to share the quota with sync callers too.
     """
 
     def __init__(
         self,
         requests_per_second: float = 10.0,
         tokens_per_minute: int = 100_000,
+        buckets: RateLimitBuckets | None = None,
+        jitter: bool = False,
     ):
         """Initialize async rate limiter.
 
         Args:
             requests_per_second: Maximum requests per second
             tokens_per_minute: Maximum tokens per minute
+            buckets: Buckets shared with a RateLimiter. When given, the two
+                limits above are ignored in favor of the buckets' own.
+            jitter: Stretch each wait by a random 0-50%
         """
-        # Request limiter
-        self._request_bucket = RateLimitState(
-            available=requests_per_second,
-            max_tokens=requests_per_second,
-            refill_rate=requests_per_second,
-            last_update=time.monotonic(),
-        )
-
-        # Token limiter
-        tokens_per_second = tokens_per_minute / 60.0
-        self._token_bucket = RateLimitState(
-            available=tokens_per_minute,
-            max_tokens=tokens_per_minute,
-            refill_rate=tokens_per_second,
-            last_update=time.monotonic(),
-        )
-
-        self._lock = asyncio.Lock()
-
-    def _refill(self, bucket: RateLimitState) -> None:
-        """Refill tokens in a bucket based on elapsed time."""
-        now = time.monotonic()
-        elapsed = now - bucket.last_update
-        new_tokens = elapsed * bucket.refill_rate
-        bucket.available = min(bucket.max_tokens, bucket.available + new_tokens)
-        bucket.last_update = now
+        if buckets is None:
+            buckets = RateLimitBuckets(requests_per_second, tokens_per_minute)
+        self._buckets = buckets
+        self._reserve = buckets.reserve
+        self._jitter = jitter
 
     async def acquire(
         self,
         request_tokens: int = 1,
         token_count: int = 0,
+        _sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+        _random: Callable[[], float] = random.random,
     ) -> float:
         """Acquire from both rate limits asynchronously.
 
@@ -250,34 +441,27 @@ class AsyncRateLimiter:
         Returns:
             Total time waited in seconds
         """
-        total_wait = 0.0
-
-        async with self._lock:
-            # Request bucket
-            self._refill(self._request_bucket)
-            if self._request_bucket.available >= request_tokens:
-                self._request_bucket.available -= request_tokens
-            else:
-                needed = request_tokens - self._request_bucket.available
-                wait_time = needed / self._request_bucket.refill_rate
-                total_wait += wait_time
-                await asyncio.sleep(wait_time)
-                self._refill(self._request_bucket)
-                self._request_bucket.available -= request_tokens
-
-            # Token bucket
-            self._refill(self._token_bucket)
-            if self._token_bucket.available >= token_count:
-                self._token_bucket.available -= token_count
-            else:
-                needed = token_count - self._token_bucket.available
-                wait_time = needed / self._token_bucket.refill_rate
-                total_wait += wait_time
-                await asyncio.sleep(wait_time)
-                self._refill(self._token_bucket)
-                self._token_bucket.available -= token_count
-
-        return total_wait
+        # Locking and reservation scheme: see RateLimitBuckets.reserve
+        wait = self._reserve(request_tokens, token_count)
+
+        if wait > 0:
+            if self._jitter:
+                wait += wait * 0.5 * _random()
+            await _sleep(wait)
+
+        return wait
+
+    def refund(self, tokens: float) -> None:
+        """Return unused tokens to the token bucket.
+
+        Does not take a lock or suspend; the refund is applied by the next
+        acquire or get_wait_time call. A negative value charges tokens that the
+        estimate missed.
+
+        Args:
+            tokens: Number of tokens to return (negative to charge)
+        """
+        self._buckets.refund(tokens)
 
     async def get_wait_time(
         self,
@@ -285,18 +469,4 @@ class AsyncRateLimiter:
         token_count: int = 0,
     ) -> float:
         """Calculate wait time without acquiring."""
-        async with self._lock:
-            self._refill(self._request_bucket)
-            self._refill(self._token_bucket)
-
-            wait_request = 0.0
-            if self._request_bucket.available < request_tokens:
-                needed = request_tokens - self._request_bucket.available
-                wait_request = needed / self._request_bucket.refill_rate
-
-            wait_token = 0.0
-            if self._token_bucket.available < token_count:
-                needed = token_count - self._token_bucket.available
-                wait_token = needed / self._token_bucket.refill_rate
-
-            return max(wait_request, wait_token)
+        return self._buckets.wait_time(request_tokens, token_count)
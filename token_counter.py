@@ -1,5 +1,9 @@
 """Token counting utilities using tiktoken."""
 
+import functools
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
 from typing import Any
 
 import tiktoken
@@ -12,24 +16,171 @@ except ImportError:
 # Default encoding for Mistral models (compatible with GPT models)
 DEFAULT_ENCODING = "cl100k_base"
 
+# Tokenizer loaded by the optional HuggingFace backend
+DEFAULT_HF_TOKENIZER = "mistralai/Mistral-7B-v0.1"
+
+# Number of distinct texts whose token counts are memoized per tokenizer
+DEFAULT_CACHE_SIZE = 1024
+
+# Below this many uncached texts, encoding them one by one beats the thread
+# pool that tiktoken spins up for every batch call.
+BATCH_THRESHOLD = 8
+
+
+@functools.lru_cache(maxsize=8)
+def _get_encoding(encoding_name: str) -> tiktoken.Encoding:
+    """Load a tiktoken encoding once per process and share it across counters."""
+    return tiktoken.get_encoding(encoding_name)
+
+
+class _HFEncoding:
+    """Adapter exposing a HuggingFace ``tokenizers`` tokenizer via tiktoken's encode API."""
+
+    def __init__(self, tokenizer_name: str):
+        try:
+            from tokenizers import Tokenizer
+        except ImportError as e:
+            raise TokenCountingError(
+                "The 'hf_fast' backend requires the 'tokenizers' package "
+                "(pip install 'mistral-ratelimit[hf]')"
+            ) from e
+        self._tokenizer = Tokenizer.from_pretrained(tokenizer_name)
+
+    def encode_ordinary(self, text: str) -> list[int]:
+        return self._tokenizer.encode(text, add_special_tokens=False).ids
+
+    def encode_ordinary_batch(self, texts: list[str]) -> list[list[int]]:
+        encodings = self._tokenizer.encode_batch(texts, add_special_tokens=False)
+        return [encoding.ids for encoding in encodings]
+
+
+@functools.lru_cache(maxsize=8)
+def _get_hf_encoding(tokenizer_name: str) -> _HFEncoding:
+    """Load a HuggingFace tokenizer once per process and share it across counters."""
+    return _HFEncoding(tokenizer_name)
+
+
+@functools.cache
+def _get_count_cache(
+    tokenizer_key: str, cache_size: int
+) -> tuple[OrderedDict[str, int], threading.Lock]:
+    """Return the count cache shared by every counter with the same tokenizer and size."""
+    return OrderedDict(), threading.Lock()
+
 
 class TokenCounter:
     """Token counter using tiktoken.
 
     Provides accurate token counting for messages using tiktoken's
     cl100k_base encoding, which is compatible with Mistral models.
+    With ``backend="hf_fast"`` it uses Mistral's own tokenizer through the
+    Rust-based HuggingFace ``tokenizers`` package instead. The tokenizer is
+    loaded on the first exact count, so the fast estimates never pay for it.
     """
 
-    def __init__(self, encoding_name: str = DEFAULT_ENCODING):
+    def __init__(
+        self,
+        encoding_name: str = DEFAULT_ENCODING,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+        backend: str = "tiktoken",
+        hf_tokenizer: str = DEFAULT_HF_TOKENIZER,
+    ):
         """Initialize token counter.
 
         Args:
             encoding_name: Tiktoken encoding to use (default: cl100k_base)
+            cache_size: Number of distinct texts whose counts are memoized, shared with
+                other counters using the same tokenizer (default: 1024)
+            backend: Tokenizer backend, "tiktoken" or "hf_fast" (default: tiktoken)
+            hf_tokenizer: Tokenizer loaded by the "hf_fast" backend
         """
+        if backend == "tiktoken":
+            tokenizer_key = f"tiktoken:{encoding_name}"
+        elif backend == "hf_fast":
+            tokenizer_key = f"hf_fast:{hf_tokenizer}"
+        else:
+            raise TokenCountingError(f"Unknown tokenizer backend '{backend}'")
+        self._backend = backend
+        self._encoding_name = encoding_name
+        self._hf_tokenizer = hf_tokenizer
+
+        # Chat workloads resend the same system prompt and history on every turn,
+        # so repeated texts are served from an LRU cache instead of being re-tokenized.
+        # The cache is per tokenizer, so every client in the process shares its hits.
+        # Lookups are lock-free; the lock only serializes inserts and evictions.
+        self._cache, self._cache_lock = _get_count_cache(tokenizer_key, cache_size)
+        self._cache_size = cache_size
+
+    @functools.cached_property
+    def _encoding(self) -> tiktoken.Encoding | _HFEncoding:
+        """Tokenizer for exact counts, loaded on first use."""
+        if self._backend == "tiktoken":
+            try:
+                return _get_encoding(self._encoding_name)
+            except Exception as e:
+                raise TokenCountingError(
+                    f"Failed to load encoding '{self._encoding_name}': {e}"
+                ) from e
         try:
-            self._encoding = tiktoken.get_encoding(encoding_name)
+            return _get_hf_encoding(self._hf_tokenizer)
+        except TokenCountingError:
+            raise
         except Exception as e:
-            raise TokenCountingError(f"Failed to load encoding '{encoding_name}': {e}")
+            raise TokenCountingError(f"Failed to load tokenizer '{self._hf_tokenizer}': {e}") from e
+
+    def _count_cached(self, text: str) -> int:
+        """Return the token count for text, tokenizing only on a cache miss."""
+        try:
+            count = self._cache[text]
+            self._cache.move_to_end(text)
+        except KeyError:
+            count = len(self._encoding.encode_ordinary(text))
+            self._remember(text, count)
+        return count
+
+    def _remember(self, text: str, count: int) -> None:
+        """Store a token count, evicting the least recently used entry if full."""
+        with self._cache_lock:
+            self._cache[text] = count
+            if len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+
+    def count_texts_batch(self, texts: list[str]) -> list[int]:
+        """Count tokens for several texts at once.
+
+        Cached texts are looked up individually; the remaining ones are tokenized
+        in a single tiktoken batch call, which encodes them in parallel in Rust.
+
+        Args:
+            texts: Texts to count tokens for
+
+        Returns:
+            Token count for each text, in the same order
+        """
+        cache = self._cache
+        counts: list[int | None] = []
+        for text in texts:
+            count = cache.get(text)
+            if count is not None:
+                try:
+                    cache.move_to_end(text)
+                except KeyError:  # Evicted by another thread; count it again
+                    count = None
+            counts.append(count)
+        missing = list(
+            dict.fromkeys(text for text, n in zip(texts, counts, strict=True) if n is None)
+        )
+        if not missing:
+            return counts  # type: ignore[return-value]
+
+        if len(missing) < BATCH_THRESHOLD:
+            encoded = [self._encoding.encode_ordinary(text) for text in missing]
+        else:
+            encoded = self._encoding.encode_ordinary_batch(missing)
+        fresh = dict(zip(missing, map(len, encoded), strict=True))
+        for text, count in fresh.items():
+            self._remember(text, count)
+        return [fresh[text] if n is None else n for text, n in zip(texts, counts, strict=True)]
 
     def count_messages(self, messages: list[dict[str, Any]]) -> int:
         """Count tokens in a list of messages.
@@ -42,6 +193,33 @@ class TokenCounter:
         Returns:
             Total token count
         """
+        return self._count_messages(messages, self.count_texts_batch)
+
+    def estimate_messages_fast(self, messages: list[dict[str, Any]]) -> int:
+        """Estimate tokens in a list of messages without running the tokenizer.
+
+        Applies the same per-message overhead as count_messages, but sizes text
+        content with estimate_text_fast.
+
+        Args:
+            messages: List of message dictionaries with 'role' and 'content' keys
+
+        Returns:
+            Estimated total token count
+        """
+        return self._count_messages(messages, self.estimate_texts_fast)
+
+    def _count_messages(
+        self,
+        messages: list[dict[str, Any]],
+        count_texts: Callable[[list[str]], list[int]],
+    ) -> int:
+        """Count tokens in a list of messages, sizing text content with count_texts.
+
+        String contents are gathered first and sized in one count_texts call, so
+        uncached messages are tokenized in a single batch. With count_texts_batch,
+        cached messages are marked recently used just as count_text marks them.
+        """
         if not messages:
             return 0
 
@@ -50,10 +228,11 @@ class TokenCounter:
 
         total_tokens = tokens_per_message * len(messages)
 
+        texts: list[str] = []
         for message in messages:
             content = message.get("content", "")
             if isinstance(content, str):
-                total_tokens += len(self._encoding.encode_ordinary(content))
+                texts.append(content)
                 total_tokens += tokens_per_name if message.get("name") else 0
 
             # Handle content as list (for multimodal messages)
@@ -61,12 +240,14 @@ class TokenCounter:
                 for item in content:
                     if isinstance(item, dict):
                         if item.get("type") == "text":
-                            total_tokens += self._encoding.encodeordinary(item.get("text", ""))
+                            texts.append(item.get("text", ""))
                         elif item.get("type") == "image_url":
                             # Approximate tokens for image URLs
                             # This is a rough estimate - actual varies by model
                             total_tokens += 85
 
+        total_tokens += sum(count_texts(texts))
+
         # Add 2 tokens for the assistant message prefix
         total_tokens += 2
 
@@ -81,7 +262,34 @@ class TokenCounter:
         Returns:
             Token count
         """
-        return len(self._encoding.encode(text))
+        return self._count_cached(text)
+
+    def estimate_text_fast(self, text: str) -> int:
+        """Estimate tokens in plain text without running the tokenizer.
+
+        Assumes roughly 4 UTF-8 bytes per token, which is typical for BPE
+        tokenizers on English text. Meant for reserving rate-limit capacity,
+        where the estimate is reconciled against actual usage afterwards.
+
+        Args:
+            text: Text to estimate tokens for
+
+        Returns:
+            Estimated token count
+        """
+        size = len(text) if text.isascii() else len(text.encode("utf-8"))
+        return (size + 3) // 4
+
+    def estimate_texts_fast(self, texts: list[str]) -> list[int]:
+        """Estimate tokens for several texts without running the tokenizer.
+
+        Args:
+            texts: Texts to estimate tokens for
+
+        Returns:
+            Estimated token count for each text, in the same order
+        """
+        return [self.estimate_text_fast(text) for text in texts]
 
     def estimate_response_tokens(
         self,